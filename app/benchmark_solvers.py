@@ -0,0 +1,134 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from solution import (backtracking_solver, generate_nqueens_solution, min_conflicts_solver,
+                      ml_nqueens_solver, rl_nqueens_solver)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import DATA_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
+
+BASELINE_PATH = os.path.join(DATA_DIR, "solver_benchmark.json")
+DEFAULT_SIZES = list(range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1))
+REGRESSION_TOLERANCE = 0.2
+# p50 changes smaller than this are timer noise on microsecond-scale solvers
+MIN_REGRESSION_MS = 0.5
+
+
+def is_valid_game_solution(queens, board_size):
+    # The game's rule: one queen per column, no two queens touching diagonally
+    if queens is None or len(queens) != board_size or len(set(queens)) != board_size:
+        return False
+    return all(abs(queens[r] - queens[r + 1]) != 1 for r in range(board_size - 1))
+
+
+# Each entry returns the placement only; the RL solver runs cold and does not
+# save its Q-table, so a benchmark never changes the models directory
+SOLVERS = {
+    "backtracking": backtracking_solver,
+    "ml": lambda n: ml_nqueens_solver(n)[0],
+    "rl": lambda n: rl_nqueens_solver(n, warm_start=False, persist=False),
+    "min_conflicts": lambda n: min_conflicts_solver(n, seed=0),
+    "generate": generate_nqueens_solution,
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    # Nearest-rank percentile
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def benchmark(solver, board_size, repeats):
+    # One untimed call first, so one-off loading and caching is not counted
+    try:
+        solver(board_size)
+    except Exception:
+        pass
+
+    timings, successes = [], 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            queens = solver(board_size)
+        except Exception:
+            queens = None
+        timings.append((time.perf_counter() - start) * 1000)
+        successes += is_valid_game_solution(queens, board_size)
+
+    # Memory is measured on a separate call, since tracing slows the timed ones
+    tracemalloc.start()
+    try:
+        solver(board_size)
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(timings, 50), 4),
+        "p99_ms": round(percentile(timings, 99), 4),
+        "peak_kib": round(peak / 1024, 1),
+        "success_rate": successes / repeats,
+    }
+
+
+def run(solver_names, sizes, repeats, rl_repeats):
+    results = {}
+    for name in solver_names:
+        results[name] = {}
+        for size in sizes:
+            stats = benchmark(SOLVERS[name], size, rl_repeats if name == "rl" else repeats)
+            results[name][str(size)] = stats
+            print(f"{name:<14} {size:>2}x{size:<2}  p50 {stats['p50_ms']:>9.3f} ms  p99 {stats['p99_ms']:>9.3f} ms  "
+                  f"peak {stats['peak_kib']:>8.1f} KiB  success {stats['success_rate']:.0%}")
+    return {"python": platform.python_version(), "repeats": repeats, "results": results}
+
+
+def compare(report, baseline, tolerance=REGRESSION_TOLERANCE, min_ms=MIN_REGRESSION_MS):
+    # A regression is a p50 slower by both the relative tolerance and at
+    # least min_ms, or a lower success rate
+    regressions = []
+    for name, sizes in report["results"].items():
+        for size, stats in sizes.items():
+            base = baseline.get("results", {}).get(name, {}).get(size)
+            if base is None:
+                continue
+            slower = stats["p50_ms"] - base["p50_ms"]
+            if stats["p50_ms"] > base["p50_ms"] * (1 + tolerance) and slower >= min_ms:
+                regressions.append(f"{name} {size}x{size}: p50 {base['p50_ms']} -> {stats['p50_ms']} ms")
+            if stats["success_rate"] < base["success_rate"]:
+                regressions.append(f"{name} {size}x{size}: success {base['success_rate']:.0%} -> {stats['success_rate']:.0%}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every N-Queens solver")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--rl-repeats", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON baseline to compare against")
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument("--min-ms", type=float, default=MIN_REGRESSION_MS,
+                        help="ignore p50 changes smaller than this")
+    args = parser.parse_args()
+
+    report = run(args.solvers, args.sizes, args.repeats, args.rl_repeats)
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Saved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.min_ms)
+        for line in regressions:
+            print(f"❌ Regression: {line}")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against baseline")
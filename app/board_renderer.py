@@ -0,0 +1,49 @@
+class BoardRenderer:
+    # Cell rectangles are created once per game and kept by canvas item id;
+    # after that only queen images are added, swapped or deleted, and only
+    # cells whose colour actually changed are recoloured.
+    def __init__(self, canvas, grid, cell_size, crown_image, conflict_image):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        self.crown_image = crown_image
+        self.conflict_image = conflict_image
+        self.grid = [row[:] for row in grid]
+        self.cell_items = {}
+        self.queen_items = {}
+
+        canvas.delete("all")
+        for i, row in enumerate(grid):
+            for j, color in enumerate(row):
+                self.cell_items[(i, j)] = canvas.create_rectangle(
+                    j * cell_size, i * cell_size,
+                    (j+1) * cell_size, (i+1) * cell_size,
+                    fill=color, outline="black"
+                )
+
+    def recolor(self, grid):
+        for i, row in enumerate(grid):
+            for j, color in enumerate(row):
+                if self.grid[i][j] != color:
+                    self.grid[i][j] = color
+                    self.canvas.itemconfigure(self.cell_items[(i, j)], fill=color)
+
+    def sync(self, board):
+        for position in [p for p in self.queen_items if p not in board]:
+            item, _ = self.queen_items.pop(position)
+            self.canvas.delete(item)
+
+        for row, col in board.queens:
+            valid = board.is_queen_valid(row, col)
+            image = self.crown_image if valid else self.conflict_image
+            current = self.queen_items.get((row, col))
+            if current is None:
+                item = self.canvas.create_image(
+                    col * self.cell_size + self.cell_size // 2,
+                    row * self.cell_size + self.cell_size // 2,
+                    image=image,
+                    anchor="center"
+                )
+                self.queen_items[(row, col)] = (item, valid)
+            elif current[1] != valid:
+                self.canvas.itemconfigure(current[0], image=image)
+                self.queen_items[(row, col)] = (current[0], valid)
@@ -0,0 +1,87 @@
+class BoardState:
+    # Occupancy of the player's board. Queens conflict when they share a row,
+    # column or colour region, or touch diagonally. conflict_count sums the
+    # clashes over every pair of queens, a pair counting once per rule it
+    # breaks, so checks and win detection never scan all queens.
+    def __init__(self, color_grid):
+        self.board_size = n = len(color_grid)
+        region_ids = {}
+        self.region_of = []
+        for row in color_grid:
+            for color in row:
+                self.region_of.append(region_ids.setdefault(color, len(region_ids)))
+        self.region_count = len(region_ids)
+
+        self.diagonal_mask = []
+        for r in range(n):
+            for c in range(n):
+                mask = 0
+                for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                    if 0 <= r + dr < n and 0 <= c + dc < n:
+                        mask |= 1 << ((r + dr) * n + c + dc)
+                self.diagonal_mask.append(mask)
+        self.clear()
+
+    def clear(self):
+        n = self.board_size
+        self.queens = set()
+        self.row_count = [0] * n
+        self.col_count = [0] * n
+        self.region_count_of = [0] * self.region_count
+        self.row_cols = [[] for _ in range(n)]
+        self.occupied = 0
+        self.conflict_count = 0
+
+    def __len__(self):
+        return len(self.queens)
+
+    def __contains__(self, position):
+        return position in self.queens
+
+    def conflicts_with(self, row, col):
+        # Number of queens already on the board that a queen here would clash with
+        cell = row * self.board_size + col
+        diagonal = (self.occupied & self.diagonal_mask[cell]).bit_count()
+        return self.row_count[row] + self.col_count[col] + self.region_count_of[self.region_of[cell]] + diagonal
+
+    def is_valid_placement(self, row, col):
+        return self.conflicts_with(row, col) == 0
+
+    def place(self, row, col):
+        if (row, col) in self.queens:
+            return
+        cell = row * self.board_size + col
+        self.conflict_count += self.conflicts_with(row, col)
+        self.queens.add((row, col))
+        self.row_count[row] += 1
+        self.col_count[col] += 1
+        self.region_count_of[self.region_of[cell]] += 1
+        self.row_cols[row].append(col)
+        self.occupied |= 1 << cell
+
+    def remove(self, row, col):
+        if (row, col) not in self.queens:
+            return
+        cell = row * self.board_size + col
+        self.queens.discard((row, col))
+        self.row_count[row] -= 1
+        self.col_count[col] -= 1
+        self.region_count_of[self.region_of[cell]] -= 1
+        self.row_cols[row].remove(col)
+        self.occupied &= ~(1 << cell)
+        self.conflict_count -= self.conflicts_with(row, col)
+
+    def is_queen_valid(self, row, col):
+        # Recomputed from the live counts, so removing a queen also clears
+        # the conflict it caused for the others
+        cell = row * self.board_size + col
+        return (self.row_count[row] == 1 and self.col_count[col] == 1
+                and self.region_count_of[self.region_of[cell]] == 1
+                and not self.occupied & self.diagonal_mask[cell])
+
+    def is_solved(self):
+        return len(self.queens) == self.board_size and self.conflict_count == 0
+
+    def partial_board(self):
+        # Column per row for the recommender, -1 for empty rows
+        return [cols[-1] if cols else -1 for cols in self.row_cols]
@@ -1,8 +1,18 @@
+import argparse
+import csv
+import json
 import os
 import pandas as pd
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from config import DATA_DIR
+from score_store import ScoreStore
+
+DATASET_PATH = os.path.join(DATA_DIR, "difficulty_data.csv")
+# Id of the last score already appended to the dataset
+STATE_PATH = os.path.join(DATA_DIR, "difficulty_data.state.json")
+COLUMNS = ["board_size", "time_taken", "difficulty"]
+CHUNK_SIZE = 50000
 
 def assign_difficulty(board_size, time_taken):
     if board_size <= 5 and time_taken < 30:
@@ -12,30 +22,64 @@ def assign_difficulty(board_size, time_taken):
     else:
         return "Hard"
 
-def generate_difficulty_csv():
-    scoreboard_path = os.path.join(DATA_DIR, "scoreboard.txt")
-    output_path = os.path.join(DATA_DIR, "difficulty_data.csv")
-    
-    if not os.path.exists(scoreboard_path):
-        print("❌ No scoreboard.txt found.")
-        return
-    
-    rows = []
-    with open(scoreboard_path, "r") as f:
-        for line in f:
-            try:
-                parts = line.strip().split(" - ")
-                board_info = parts[1]  # e.g., 6x6
-                time_taken = int(parts[2].replace("Time: ", "").replace("s", ""))
-                board_size = int(board_info.split("x")[0])
-                difficulty = assign_difficulty(board_size, time_taken)
-                rows.append((board_size, time_taken, difficulty))
-            except Exception as e:
-                print(f"Skipping line: {line.strip()} - Error: {e}")
-
-    df = pd.DataFrame(rows, columns=["board_size", "time_taken", "difficulty"])
-    df.to_csv(output_path, index=False)
-    print(f"✅ Saved difficulty dataset to {output_path}")
+def load_state(state_path=STATE_PATH):
+    # None when the dataset has never been built from the score store
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)["last_id"]
+    except FileNotFoundError:
+        return None
+
+def save_state(last_id, state_path=STATE_PATH):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"last_id": last_id}, f)
+    os.replace(tmp_path, state_path)
+
+def new_rows(store, last_id):
+    # (id, board_size, time_taken, difficulty) for games not yet in the dataset
+    for score_id, _, board_size, time_taken in store.iter_since(last_id):
+        yield score_id, board_size, time_taken, assign_difficulty(board_size, time_taken)
+
+def generate_difficulty_csv(output_path=DATASET_PATH, state_path=STATE_PATH, rebuild=False, store=None):
+    # Appends only the games recorded since the last run, so the cost is
+    # proportional to the new games rather than the whole history. Without
+    # a saved state the CSV is rewritten from scratch, as with rebuild.
+    own_store = store is None
+    if own_store:
+        store = ScoreStore()
+    last_id = None if rebuild else load_state(state_path)
+    if last_id is None:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        last_id = 0
+    write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+
+    added = 0
+    with open(output_path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(COLUMNS)
+        for score_id, *row in new_rows(store, last_id):
+            writer.writerow(row)
+            last_id = score_id
+            added += 1
+    if own_store:
+        store.close()
+
+    # Written after the rows are flushed, so a crash can only repeat rows, never drop them
+    save_state(last_id, state_path)
+    print(f"✅ Appended {added} rows to {output_path}")
+    return added
+
+def read_difficulty_chunks(path=DATASET_PATH, chunk_size=CHUNK_SIZE):
+    # Yields DataFrames of at most chunk_size rows, so callers never need the
+    # whole CSV in memory as text
+    yield from pd.read_csv(path, usecols=COLUMNS, chunksize=chunk_size,
+                           dtype={"board_size": "int16", "time_taken": "int32", "difficulty": "category"})
 
 if __name__ == "__main__":
-    generate_difficulty_csv()
+    parser = argparse.ArgumentParser(description="Append new scores to the difficulty dataset")
+    parser.add_argument("--rebuild", action="store_true", help="rewrite the dataset from every recorded score")
+    args = parser.parse_args()
+    generate_difficulty_csv(rebuild=args.rebuild)
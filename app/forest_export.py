@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import MODEL_DIR
+
+LEAF = -1
+
+
+def export_forest(model, path):
+    # All trees are laid end to end in one set of node arrays; child indices
+    # are rebased so they point straight into the concatenated arrays
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == LEAF
+        value = tree.value[:, 0, :].astype(np.float64)
+        roots.append(offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(is_leaf, LEAF, tree.children_left + offset))
+        rights.append(np.where(is_leaf, LEAF, tree.children_right + offset))
+        values.append(value / value.sum(axis=1, keepdims=True))
+        offset += tree.node_count
+
+    np.savez(
+        path,
+        classes=model.classes_,
+        roots=np.array(roots, dtype=np.int32),
+        feature=np.concatenate(features).astype(np.int32),
+        threshold=np.concatenate(thresholds),
+        left=np.concatenate(lefts).astype(np.int32),
+        right=np.concatenate(rights).astype(np.int32),
+        value=np.concatenate(values).astype(np.float32),
+    )
+
+
+class CompactForest:
+    # Drop-in for the predict / predict_proba calls the game makes on a
+    # RandomForestClassifier, without importing sklearn
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.classes_ = data["classes"]
+            self.roots = data["roots"]
+            self.feature = data["feature"]
+            self.threshold = data["threshold"]
+            self.left = data["left"]
+            self.right = data["right"]
+            self.value = data["value"]
+
+    def apply(self, X):
+        # sklearn compares float32 features against the split thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        while True:
+            left = self.left[nodes]
+            active = left != LEAF
+            if not active.any():
+                return nodes
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(active, np.where(go_left, left, self.right[nodes]), nodes)
+
+    def predict_proba(self, X):
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def compact_path(pickle_path):
+    return os.path.splitext(pickle_path)[0] + ".npz"
+
+
+def export_model_file(pickle_path):
+    import pickle
+    with open(pickle_path, "rb") as f:
+        model = pickle.load(f)
+    export_forest(model, compact_path(pickle_path))
+    return compact_path(pickle_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export pickled forests to compact .npz files")
+    parser.add_argument("paths", nargs="*", help="model pickles (default: every .pkl in models/)")
+    args = parser.parse_args()
+    paths = args.paths or sorted(os.path.join(MODEL_DIR, name) for name in os.listdir(MODEL_DIR) if name.endswith(".pkl"))
+    for path in paths:
+        print(f"✅ Exported {os.path.basename(path)} to {os.path.basename(export_model_file(path))}")
@@ -0,0 +1,91 @@
+from hint_engine import load_hint_engine
+from model_registry import get_model
+from region_solver import RegionSolver
+from solution import recommendation_features, recommend_moves
+
+
+class HintTable:
+    # Move hints for one puzzle. Sizes with an exact hint table use it as a
+    # prefilter for the columns that can still complete the queens; with the
+    # puzzle's colour grid, columns in an occupied region go next, and the
+    # rest are kept only if the region solver can still finish the board
+    # from there. The puzzle's own solution column comes first when it
+    # survives. The recommender model is only a fallback for sizes with a
+    # model but no hint table; none ship today, since hint tables go up to
+    # MAX_HINT_BOARD_SIZE and the models stop at MAX_ML_BOARD_SIZE. Its
+    # answers are keyed by the feature vector, with every prefix of the
+    # solution and every one-queen deviation from it scored in a single
+    # batched call when the puzzle is prepared.
+    def __init__(self, board_size, solution=None, grid=None):
+        self.board_size = board_size
+        self.solution = solution
+        self.grid = grid
+        self.engine = load_hint_engine(board_size)
+        self._region_solver = None
+        self.exact_hints = {}
+        self.hints = {}
+        self.misses = 0
+        boards = []
+        # Only sizes without a hint table but with a recommender model precompute
+        if self.engine is None and solution is not None and get_model("recommender", board_size) is not None:
+            for row in range(board_size + 1):
+                boards.append(list(solution[:row]) + [-1] * (board_size - row))
+                if row:
+                    for col in range(board_size):
+                        if col != solution[row - 1]:
+                            boards.append(list(solution[:row - 1]) + [col] + [-1] * (board_size - row))
+        self.add(boards)
+
+    def key(self, partial_board):
+        return tuple(recommendation_features(list(partial_board), self.board_size))
+
+    def add(self, partial_boards):
+        new = {}
+        for board in partial_boards:
+            new.setdefault(self.key(board), board)
+        for key in [k for k in new if k in self.hints]:
+            del new[key]
+        if new:
+            self.hints.update(zip(new, recommend_moves(list(new.values()), self.board_size)))
+
+    def lookup(self, partial_board):
+        # (best column, ranked legal columns) for the next row
+        if self.engine is not None:
+            return self._exact(partial_board)
+        key = self.key(partial_board)
+        hint = self.hints.get(key)
+        if hint is None:
+            self.misses += 1
+            self.add([partial_board])
+            hint = self.hints[key]
+        return hint
+
+    def _exact(self, partial_board):
+        key = tuple(partial_board)
+        hint = self.exact_hints.get(key)
+        if hint is not None:
+            return hint
+        columns = self.engine.legal_columns(partial_board)
+        row = self.engine.next_row(partial_board)
+        if self.grid is not None and columns:
+            columns = self._region_filter(partial_board, row, columns)
+        if self.solution is not None and row is not None and self.solution[row] in columns:
+            columns.remove(self.solution[row])
+            columns.insert(0, self.solution[row])
+        hint = self.exact_hints[key] = ((columns[0] if columns else None), columns)
+        return hint
+
+    def _region_filter(self, partial_board, row, columns):
+        if self._region_solver is None:
+            self._region_solver = RegionSolver(self.grid)
+        placed = [(r, c) for r, c in enumerate(partial_board) if c != -1]
+        occupied = {self.grid[r][c] for r, c in placed}
+        return [c for c in columns
+                if self.grid[row][c] not in occupied
+                and self._region_solver.is_completable(placed + [(row, c)])]
+
+    def best(self, partial_board):
+        return self.lookup(partial_board)[0]
+
+    def ranked(self, partial_board):
+        return self.lookup(partial_board)[1]
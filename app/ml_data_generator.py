@@ -1,21 +1,44 @@
+import argparse
 import numpy as np
 import pickle
-from solution import backtracking_solver
+from multiprocessing import Pool
+from solution_index import first_solution, index_path
+import solution_index
 import os
-import random
-def generate_training_data(board_size, n_samples=1000, noise_prob=0.15):
-    X, y = [], []
-    for _ in range(n_samples):
-        solution = backtracking_solver(board_size)
-        for row, col in enumerate(solution):
-            features = [row, board_size, row % 2, row // 2]
-            if random.random() < noise_prob:
-                # Introduce noise: assign a wrong column for this row
-                wrong_cols = [c for c in range(board_size) if c != col]
-                col = random.choice(wrong_cols)
-            X.append(features)
-            y.append(col)
-    return np.array(X), np.array(y)
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import MODEL_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
+from model_registry import MODEL_FILES
+from forest_export import compact_path, export_forest
+
+DEFAULT_SIZES = list(range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1))
+
+
+def solution_pool(board_size):
+    # The solver model maps a row to one fixed column, so by default every
+    # sample is drawn from a pool holding only the first solution. Pass
+    # solution_index.solution_array(n) as `solutions` to train on variety.
+    return np.array([first_solution(board_size)], dtype=np.int64)
+
+
+def generate_training_data(board_size, n_samples=1000, noise_prob=0.15, solutions=None, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    solutions = solution_pool(board_size) if solutions is None else np.asarray(solutions, dtype=np.int64)
+    picks = solutions[rng.integers(len(solutions), size=n_samples)]
+
+    # Introduce noise: swap a random share of labels for a wrong column,
+    # drawn uniformly from the other board_size - 1 columns
+    noisy = rng.random(picks.shape) < noise_prob
+    shift = rng.integers(1, board_size, size=picks.shape)
+    y = np.where(noisy, (picks + shift) % board_size, picks).ravel()
+
+    rows = np.tile(np.arange(board_size), n_samples)
+    X = np.empty((n_samples * board_size, 4), dtype=np.int64)
+    X[:, 0] = rows
+    X[:, 1] = board_size
+    X[:, 2] = rows % 2
+    X[:, 3] = rows // 2
+    return X, y
 
 
 def train_and_save_model(board_size):
@@ -23,38 +46,99 @@ def train_and_save_model(board_size):
     from sklearn.ensemble import RandomForestClassifier
     model = RandomForestClassifier(n_estimators=100, random_state=42)
     model.fit(X, y)
-    os.makedirs("../models", exist_ok=True)  # create if not exists
-    with open(f"../models/model_{board_size}x{board_size}.pkl", "wb") as f:
+    with open(model_path("solver", board_size), "wb") as f:
         pickle.dump(model, f)
+    export_forest(model, compact_path(model_path("solver", board_size)))
     print(f"✅ Saved model for {board_size}x{board_size} to model_{board_size}x{board_size}.pkl")
 
-# Example: train for 4x4 to 14x14
-for size in range(4, 15):
-    train_and_save_model(size)
-
-def generate_move_recommendation_data(board_size, n_samples=10000):
-    X, y = [], []
-    for _ in range(n_samples):
-        solution = backtracking_solver(board_size)
-        partial_state = [-1] * board_size
-        for row in range(board_size):
-            col = solution[row]
-            features = partial_state[:row] + [-1] * (board_size - row)
-            features.append(row)  # current row as a feature
-            X.append(features)
-            y.append(col)
-            partial_state[row] = col
-    return np.array(X), np.array(y)
+def generate_move_recommendation_data(board_size, n_samples=10000, solutions=None, rng=None):
+    rng = np.random.default_rng() if rng is None else rng
+    solutions = solution_pool(board_size) if solutions is None else np.asarray(solutions, dtype=np.int64)
+    picks = solutions[rng.integers(len(solutions), size=n_samples)]
+
+    # One row per (sample, board row): the columns placed above the current
+    # row, -1 for the rest, then the current row index as the last feature
+    X = np.full((n_samples, board_size, board_size + 1), -1, dtype=np.int64)
+    placed = np.tri(board_size, board_size, -1, dtype=bool)
+    X[:, :, :board_size] = np.where(placed, picks[:, None, :], -1)
+    X[:, :, board_size] = np.arange(board_size)
+    return X.reshape(-1, board_size + 1), picks.ravel()
 
 def train_move_recommender_model(board_size):
     from sklearn.ensemble import RandomForestClassifier
     X, y = generate_move_recommendation_data(board_size)
     model = RandomForestClassifier(n_estimators=100, random_state=42)
     model.fit(X, y)
-    os.makedirs("../models", exist_ok=True)
-    with open(f"../models/move_recommender_{board_size}.pkl", "wb") as f:
+    with open(model_path("recommender", board_size), "wb") as f:
         pickle.dump(model, f)
+    export_forest(model, compact_path(model_path("recommender", board_size)))
     print(f"✅ Move recommender model saved for {board_size}x{board_size}")
 
-for size in range(4, 15):
-    train_move_recommender_model(size)
+
+TRAINERS = {
+    "solver": train_and_save_model,
+    "recommender": train_move_recommender_model,
+}
+
+
+def model_path(kind, board_size):
+    return os.path.join(MODEL_DIR, MODEL_FILES[kind].format(n=board_size))
+
+
+def is_up_to_date(kind, board_size):
+    # A model is current when it is newer than the code that generates its
+    # training data and the solution index that data is read from
+    path = model_path(kind, board_size)
+    if not os.path.exists(path):
+        return False
+    sources = [os.path.abspath(__file__), os.path.abspath(solution_index.__file__), index_path(board_size)]
+    newest_source = max(os.path.getmtime(p) for p in sources if os.path.exists(p))
+    return os.path.getmtime(path) > newest_source
+
+
+def _train_job(job):
+    kind, board_size = job
+    TRAINERS[kind](board_size)
+
+
+def train_all(sizes=DEFAULT_SIZES, kinds=tuple(TRAINERS), n_jobs=None, force=False):
+    jobs = [(kind, size) for kind in kinds for size in sizes if force or not is_up_to_date(kind, size)]
+    if not jobs:
+        print("✅ All models are up to date")
+        return jobs
+    # Each (kind, size) model is independent, so spread them over worker processes
+    if n_jobs == 1:
+        for job in jobs:
+            _train_job(job)
+    else:
+        with Pool(n_jobs) as pool:
+            pool.map(_train_job, jobs, chunksize=1)
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the N-Queens solver and move recommender models")
+    subparsers = parser.add_subparsers(dest="command")
+    for name, help_text in [("train", "retrain stale (or all, with --force) models"),
+                            ("status", "list which models are stale")]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+        sub.add_argument("--kinds", nargs="+", choices=list(TRAINERS), default=list(TRAINERS))
+        if name == "train":
+            sub.add_argument("--n-jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+            sub.add_argument("--force", action="store_true", help="retrain even if the model is up to date")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        for kind in args.kinds:
+            for size in args.sizes:
+                state = "up to date" if is_up_to_date(kind, size) else "stale"
+                print(f"{kind:<12} {size}x{size}: {state}")
+    elif args.command == "train":
+        train_all(args.sizes, args.kinds, args.n_jobs, args.force)
+    else:
+        train_all()
+
+
+if __name__ == "__main__":
+    main()
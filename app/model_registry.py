@@ -0,0 +1,98 @@
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import MODEL_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
+from forest_export import CompactForest, compact_path
+
+MODEL_FILES = {
+    "solver": "model_{n}x{n}.pkl",
+    "recommender": "move_recommender_{n}.pkl",
+}
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class ModelRegistry:
+    # LRU cache of loaded models keyed by (kind, board_size). The compact .npz
+    # export is preferred over the pickle unless the pickle is newer. A model's
+    # file size on disk is used as its memory cost when enforcing the cap.
+    def __init__(self, model_dir=MODEL_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.model_dir = model_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def model_path(self, kind, board_size):
+        return os.path.join(self.model_dir, MODEL_FILES[kind].format(n=board_size))
+
+    def get(self, kind, board_size):
+        key = (kind, board_size)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+
+        # Load outside the lock so a preload doesn't stall the UI thread
+        path = self.model_path(kind, board_size)
+        compact = compact_path(path)
+        try:
+            if os.path.exists(compact) and (not os.path.exists(path) or
+                                            os.path.getmtime(compact) >= os.path.getmtime(path)):
+                model = CompactForest(compact)
+                nbytes = os.path.getsize(compact)
+            else:
+                with open(path, "rb") as f:
+                    model = pickle.load(f)
+                nbytes = os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = (model, nbytes)
+                self.total_bytes += nbytes
+                self._evict()
+            self._models.move_to_end(key)
+            return self._models[key][0]
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._models) > 1:
+            _, (_, nbytes) = self._models.popitem(last=False)
+            self.total_bytes -= nbytes
+
+    def invalidate(self, kind, board_size):
+        with self._lock:
+            entry = self._models.pop((kind, board_size), None)
+            if entry is not None:
+                self.total_bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self.total_bytes = 0
+
+    def preload(self, keys, background=True):
+        def load_all():
+            for kind, board_size in keys:
+                self.get(kind, board_size)
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+
+registry = ModelRegistry()
+
+
+def get_model(kind, board_size):
+    return registry.get(kind, board_size)
+
+
+def preload_models(sizes=range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1), kinds=tuple(MODEL_FILES), background=True):
+    return registry.preload([(kind, size) for size in sizes for kind in kinds], background)
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from hint_table import HintTable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import DATA_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
+
+CACHE_DIR = os.path.join(DATA_DIR, "puzzle_cache")
+# A 14x14 puzzle takes about 300 bytes and a 50x50 one under 3 KB
+MAX_CACHE_BYTES = 8 * 1024 * 1024
+MAGIC = b"NQP1"
+# magic, board_size, seed, date (YYYY-MM-DD), palette size
+HEADER = struct.Struct("<4sHQ10sH")
+
+
+def today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def daily_puzzle(date=None):
+    # (board_size, seed) of the day's puzzle; derived from the date alone, so
+    # every install deals the same one
+    digest = hashlib.sha256(f"daily:{date or today()}".encode()).digest()
+    seed = int.from_bytes(digest[:8], "little")
+    board_size = MIN_BOARD_SIZE + seed % (MAX_ML_BOARD_SIZE - MIN_BOARD_SIZE + 1)
+    return board_size, seed
+
+
+def cache_key(board_size, seed, date):
+    return hashlib.sha1(f"{board_size}:{seed}:{date}".encode()).hexdigest() + ".pzl"
+
+
+def encode_puzzle(puzzle, date):
+    # Header, RGB palette, solution columns, one palette index per cell and
+    # the float32 confidences
+    n = puzzle["board_size"]
+    colors = puzzle["colors"]
+    palette = {color: i for i, color in enumerate(colors)}
+    cells = bytes(palette[color] for row in puzzle["grid"] for color in row)
+    return b"".join([
+        HEADER.pack(MAGIC, n, puzzle["seed"], date.encode(), len(colors)),
+        b"".join(bytes.fromhex(color[1:]) for color in colors),
+        bytes(puzzle["solution"]),
+        cells,
+        array("f", puzzle["confidences"]).tobytes(),
+    ])
+
+
+def decode_puzzle(data):
+    magic, n, seed, date, palette_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a cached puzzle")
+    offset = HEADER.size
+    colors = ["#" + data[i:i + 3].hex() for i in range(offset, offset + 3 * palette_size, 3)]
+    offset += 3 * palette_size
+    solution = list(data[offset:offset + n])
+    offset += n
+    cells = data[offset:offset + n * n]
+    offset += n * n
+    confidences = array("f", data[offset:offset + 4 * n]).tolist()
+    return {
+        "board_size": n,
+        "seed": seed,
+        "date": date.decode(),
+        "colors": colors,
+        "solution": solution,
+        "confidences": confidences,
+        "grid": [[colors[c] for c in cells[i * n:(i + 1) * n]] for i in range(n)],
+    }
+
+
+class PuzzleCache:
+    # Prepared puzzles on disk, one small binary file per (board_size, seed,
+    # date), named by a hash of the key. File mtimes give the LRU order, so
+    # it survives restarts; the oldest files go once the directory is over
+    # max_bytes. Shared by the puzzle worker and the Tk thread, hence the lock.
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".pzl"):
+                stat = os.stat(os.path.join(cache_dir, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self.total_bytes += size
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, key):
+        return cache_key(*key) in self._files
+
+    def get(self, board_size, seed, date=None):
+        name = cache_key(board_size, seed, date or today())
+        path = os.path.join(self.cache_dir, name)
+        with self._lock:
+            if name not in self._files:
+                return None
+            try:
+                with open(path, "rb") as f:
+                    puzzle = decode_puzzle(f.read())
+                os.utime(path)
+            except (OSError, ValueError, struct.error):
+                self._discard(name)
+                return None
+            self._files.move_to_end(name)
+        # Hints are not stored: the exact hint table makes them cheap to rebuild
+        puzzle["hints"] = HintTable(board_size, puzzle["solution"], puzzle["grid"])
+        return puzzle
+
+    def put(self, puzzle, date=None):
+        date = date or today()
+        data = encode_puzzle(puzzle, date)
+        name = cache_key(puzzle["board_size"], puzzle["seed"], date)
+        path = os.path.join(self.cache_dir, name)
+        tmp_path = path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.total_bytes += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+            while self.total_bytes > self.max_bytes and len(self._files) > 1:
+                self._discard(next(iter(self._files)))
+
+    def _discard(self, name):
+        self.total_bytes -= self._files.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._files):
+                self._discard(name)
@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import DATA_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
+from grid import GridGenerator
+from region_solver import count_region_solutions
+from solution_index import random_solution, sample_solution
+
+PUZZLES_PATH = os.path.join(DATA_DIR, "puzzles.jsonl")
+MAX_ATTEMPTS = 2000
+CHUNK_SIZE = 25
+
+
+def generate_unique_puzzle(board_size, max_attempts=MAX_ATTEMPTS, rng=None):
+    # Regions are labelled 0..n-1 instead of hex colours so the UI can pick
+    # its own palette when it loads the puzzle
+    rng = rng if rng is not None else random.Random()
+    regions = list(range(board_size))
+    grid_generator = GridGenerator(board_size, regions, rng=rng)
+    for attempt in range(1, max_attempts + 1):
+        solution = sample_solution(board_size, rng) or random_solution(board_size, rng)
+        if solution is None:
+            return None
+        color_grid = grid_generator.generate_grid(solution)
+        if count_region_solutions(color_grid, limit=2) == 1:
+            return {
+                "board_size": board_size,
+                "solution": solution,
+                "regions": color_grid,
+                "attempts": attempt,
+            }
+    return None
+
+
+def _generate_chunk(board_size, count, max_attempts, seed):
+    # Each chunk owns its rng, so workers share no random state and a seeded
+    # run gives the same puzzles whatever order the chunks finish in
+    rng = random.Random(seed)
+    puzzles = []
+    for _ in range(count):
+        puzzle = generate_unique_puzzle(board_size, max_attempts, rng)
+        if puzzle is not None:
+            puzzles.append(puzzle)
+    return puzzles
+
+
+def generate_puzzles(sizes, count, output_path=PUZZLES_PATH, workers=None,
+                     max_attempts=MAX_ATTEMPTS, chunk_size=CHUNK_SIZE, seed=None):
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for size in sizes:
+            for start in range(0, count, chunk_size):
+                chunk_seed = None if seed is None else f"{seed}-{size}-{start}"
+                futures.append(pool.submit(_generate_chunk, size, min(chunk_size, count - start), max_attempts,
+                                           chunk_seed))
+
+        # Append each chunk as soon as it is done so an interrupted run keeps
+        # everything it already generated
+        with open(output_path, "a") as f:
+            for future in as_completed(futures):
+                for puzzle in future.result():
+                    f.write(json.dumps(puzzle, separators=(",", ":")) + "\n")
+                    written += 1
+                f.flush()
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate puzzles with a unique solution")
+    parser.add_argument("sizes", nargs="*", type=int, default=list(range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1)))
+    parser.add_argument("--count", type=int, default=100, help="puzzles per board size")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    parser.add_argument("--output", default=PUZZLES_PATH)
+    parser.add_argument("--seed", default=None, help="makes the run reproducible")
+    args = parser.parse_args()
+    written = generate_puzzles(args.sizes, args.count, args.output, args.workers, args.max_attempts,
+                               seed=args.seed)
+    print(f"✅ Appended {written} unique puzzles to {args.output}")
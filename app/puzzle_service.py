@@ -0,0 +1,176 @@
+import colorsys
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+from collections import deque
+from grid import GridGenerator
+from hint_table import HintTable
+from puzzle_cache import today
+from solution import generate_nqueens_solution, ml_nqueens_solver
+from solution_index import random_solution
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import MAX_ML_BOARD_SIZE
+
+POLL_MS = 50
+
+
+def generate_distinct_colors(n):
+    colors = []
+    for i in range(n):
+        hue = i / n
+        # Past 14 colours neighbouring hues are hard to tell apart, so alternate shades
+        saturation, value = (0.7, 0.9) if n <= 14 or i % 2 == 0 else (0.45, 0.7)
+        r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
+        colors.append(f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}')
+    return colors
+
+
+def prepare_puzzle(board_size, seed=None):
+    # Everything start_game needs before it can draw the board; runs on the
+    # worker thread, so it must not touch Tk. There is one colour per queen,
+    # so every region can hold exactly one. One rng drives every random
+    # choice, so the same (board_size, seed) always gives the same puzzle.
+    if seed is None:
+        seed = random.getrandbits(32)
+    rng = random.Random(seed)
+    colors = rng.sample(generate_distinct_colors(board_size), board_size)
+    if board_size > MAX_ML_BOARD_SIZE:
+        # No models or index this big; a randomised bitmask search is instant
+        solution = random_solution(board_size, rng)
+        confidences = [0.0] * board_size
+    else:
+        solution, confidences = ml_nqueens_solver(board_size)
+    if solution is None:
+        solution = generate_nqueens_solution(board_size, use_ml=False, use_rl=True, rng=rng)
+        confidences = [0.0] * board_size
+    grid_generator = GridGenerator(board_size, colors, rng=rng)
+    grid = grid_generator.generate_grid(solution)
+    return {
+        "board_size": board_size,
+        "seed": seed,
+        "colors": colors,
+        "solution": solution,
+        "confidences": confidences,
+        "grid": grid,
+        # Recommender answers for this board, scored in one batch off the Tk thread
+        "hints": HintTable(board_size, solution, grid),
+    }
+
+
+class PuzzleService:
+    # Prepares puzzles on a background thread and keeps `prefetch` ready ones
+    # per board size. Finished puzzles are handed back on the Tk thread by
+    # polling with root.after, since Tk must only be used from mainloop.
+    # Every prepared puzzle is also written to the disk cache, and requests
+    # for a specific seed are answered from it when possible.
+    def __init__(self, root, prefetch=1, cache=None):
+        self.root = root
+        self.prefetch = prefetch
+        self.cache = cache
+        self.ready = {}
+        self.in_flight = {}
+        self.pending = None
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._polling = False
+        self._worker = threading.Thread(target=self._work, name="puzzle-service", daemon=True)
+        self._worker.start()
+
+    def _work(self):
+        while True:
+            board_size, seed = key = self._requests.get()
+            error = None
+            try:
+                puzzle = prepare_puzzle(board_size, seed)
+            except Exception as e:
+                print(f"Puzzle preparation failed for {board_size}x{board_size}: {e}")
+                puzzle, error = None, e
+            # A cache that cannot be written only costs the next lookup
+            if puzzle is not None and self.cache is not None:
+                try:
+                    self.cache.put(puzzle, today())
+                except (OSError, struct.error) as e:
+                    print(f"Could not cache the {board_size}x{board_size} puzzle: {e}")
+            self._results.put((key, puzzle, error))
+
+    def _submit(self, key):
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+        self._requests.put(key)
+        self._start_polling()
+
+    def fill(self, sizes):
+        for size in sizes:
+            key = (size, None)
+            missing = self.prefetch - len(self.ready.get(size, ())) - self.in_flight.get(key, 0)
+            for _ in range(missing):
+                self._submit(key)
+
+    def request(self, board_size, callback, seed=None, on_error=None):
+        # Returns True when a prefetched or cached puzzle was handed over
+        # right away; otherwise `callback` runs once the worker has one, or
+        # on_error(board_size, seed, error) if preparing it fails. Only the
+        # latest request is kept, so an earlier unanswered one is dropped.
+        # With a seed, the result is always the puzzle for (board_size, seed).
+        if seed is None:
+            ready = self.ready.get(board_size)
+            puzzle = ready.popleft() if ready else None
+        else:
+            puzzle = self.cache.get(board_size, seed) if self.cache is not None else None
+        if puzzle is not None:
+            self.pending = None
+            if seed is None:
+                self.fill([board_size])
+            callback(puzzle)
+            return True
+        key = (board_size, seed)
+        self.pending = (key, callback, on_error)
+        if not self.in_flight.get(key):
+            self._submit(key)
+        return False
+
+    def cancel(self):
+        self.pending = None
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        # Rescheduled even if a callback raises, or later requests would
+        # never be answered
+        try:
+            self._deliver()
+        finally:
+            if any(self.in_flight.values()):
+                self.root.after(POLL_MS, self._poll)
+            else:
+                self._polling = False
+
+    def _deliver(self):
+        while True:
+            try:
+                key, puzzle, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.in_flight[key] -= 1
+            board_size, seed = key
+            if puzzle is None:
+                # Nothing else will answer a pending request for this key
+                if self.pending and self.pending[0] == key and not self.in_flight[key]:
+                    _, _, on_error = self.pending
+                    self.pending = None
+                    if on_error is not None:
+                        on_error(board_size, seed, error)
+                continue
+            if self.pending and self.pending[0] == key:
+                _, callback, _ = self.pending
+                self.pending = None
+                if seed is None:
+                    self.fill([board_size])
+                callback(puzzle)
+            elif seed is None:
+                self.ready.setdefault(board_size, deque()).append(puzzle)
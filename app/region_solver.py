@@ -0,0 +1,96 @@
+class RegionSolver:
+    # Cells are numbered row * board_size + col and every constraint is a
+    # bitmask over those numbers. Rows, columns and colour regions are the
+    # "units" that each need exactly one queen.
+    def __init__(self, color_grid):
+        self.board_size = n = len(color_grid)
+        region_ids = {}
+        for row in color_grid:
+            for color in row:
+                region_ids.setdefault(color, len(region_ids))
+        self.region_count = len(region_ids)
+
+        self.units = [0] * (2 * n + self.region_count)
+        self.cell_units = [0] * (n * n)
+        for r in range(n):
+            for c in range(n):
+                cell = r * n + c
+                region = 2 * n + region_ids[color_grid[r][c]]
+                for unit in (r, n + c, region):
+                    self.units[unit] |= 1 << cell
+                    self.cell_units[cell] |= 1 << unit
+
+        # Everything a queen on `cell` rules out: its row, column, region
+        # and the eight touching cells
+        self.blocked = [0] * (n * n)
+        for r in range(n):
+            for c in range(n):
+                cell = r * n + c
+                mask = self.units[r] | self.units[n + c] | self.units[2 * n + region_ids[color_grid[r][c]]]
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        if 0 <= r + dr < n and 0 <= c + dc < n:
+                            mask |= 1 << ((r + dr) * n + c + dc)
+                self.blocked[cell] = mask
+
+    def solutions(self, limit=None, fixed=()):
+        # fixed: (row, col) queens every returned solution must contain
+        n = self.board_size
+        found = []
+        if n == 0 or self.region_count != n:
+            return found
+
+        allowed, open_units, placed = (1 << (n * n)) - 1, (1 << len(self.units)) - 1, []
+        for row, col in fixed:
+            cell = row * n + col
+            if not allowed >> cell & 1:
+                return found
+            allowed &= ~self.blocked[cell]
+            open_units &= ~self.cell_units[cell]
+            placed.append(cell)
+
+        def search(allowed, open_units, placed):
+            if not open_units:
+                found.append(placed)
+                return
+            # MRV: branch on the open unit with the fewest candidate cells left
+            best_cells, best_count = 0, n * n + 1
+            units = open_units
+            while units:
+                bit = units & -units
+                units ^= bit
+                cells = allowed & self.units[bit.bit_length() - 1]
+                count = cells.bit_count()
+                if count < best_count:
+                    best_cells, best_count = cells, count
+                    if count <= 1:
+                        break
+            while best_cells:
+                bit = best_cells & -best_cells
+                best_cells ^= bit
+                cell = bit.bit_length() - 1
+                search(allowed & ~self.blocked[cell], open_units & ~self.cell_units[cell], placed + [cell])
+                if limit is not None and len(found) >= limit:
+                    return
+
+        search(allowed, open_units, placed)
+        return [[cell % n for cell in sorted(cells)] for cells in found]
+
+    def count(self, limit=None):
+        return len(self.solutions(limit))
+
+    def is_completable(self, fixed):
+        return bool(self.solutions(limit=1, fixed=fixed))
+
+
+def count_region_solutions(color_grid, limit=2):
+    return RegionSolver(color_grid).count(limit)
+
+
+def solve_region_puzzle(color_grid):
+    solutions = RegionSolver(color_grid).solutions(limit=1)
+    return solutions[0] if solutions else None
+
+
+def has_unique_solution(color_grid):
+    return count_region_solutions(color_grid, limit=2) == 1
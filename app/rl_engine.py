@@ -0,0 +1,101 @@
+import os
+import random
+import sys
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import MODEL_DIR
+
+RL_EPISODES = 5000
+REWARD_VALID = 1
+# Three n-bit masks must fit the uint64 keys of a saved table
+MAX_SAVED_BOARD_SIZE = 21
+
+
+def qtable_path(board_size):
+    return os.path.join(MODEL_DIR, f"rl_qtable_{board_size}.npz")
+
+
+class QLearningSolver:
+    # Tabular Q-learning over row-by-row placements under the classic rule.
+    # A state is the (columns, left diagonals, right diagonals) attack masks
+    # packed into one int: it decides every future move, so placements that
+    # reach the same masks share their Q-values.
+    def __init__(self, board_size, alpha=0.1, gamma=0.9):
+        self.board_size = board_size
+        self.alpha = alpha
+        self.gamma = gamma
+        self.full = (1 << board_size) - 1
+        self.q = {}
+        self._bits = {}
+
+    def state_key(self, cols, ld, rd):
+        n = self.board_size
+        return cols | ld << n | rd << (2 * n)
+
+    def free_columns(self, mask):
+        columns = self._bits.get(mask)
+        if columns is None:
+            columns = [c for c in range(self.board_size) if mask >> c & 1]
+            self._bits[mask] = columns
+        return columns
+
+    def train(self, episodes=RL_EPISODES, rng=random):
+        n, full, q = self.board_size, self.full, self.q
+        alpha, gamma = self.alpha, self.gamma
+        for _ in range(episodes):
+            cols = ld = rd = 0
+            key = 0
+            for row in range(n):
+                free = full & ~(cols | ld | rd)
+                if not free:
+                    break
+                action = rng.choice(self.free_columns(free))
+                bit = 1 << action
+                cols, ld, rd = cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1
+                next_key = self.state_key(cols, ld, rd)
+
+                values = q.get(key)
+                if values is None:
+                    values = q[key] = [0.0] * n
+                next_values = q.get(next_key)
+                best_next = max(next_values) if next_values else 0.0
+                # Only free columns are ever sampled, so every step earns the
+                # valid-move reward
+                values[action] += alpha * (REWARD_VALID + gamma * best_next - values[action])
+                key = next_key
+
+    def solve(self):
+        n, full = self.board_size, self.full
+        cols = ld = rd = 0
+        state = [-1] * n
+        for row in range(n):
+            free = full & ~(cols | ld | rd)
+            if not free:
+                return None
+            values = self.q.get(self.state_key(cols, ld, rd))
+            candidates = self.free_columns(free)
+            # Ties go to the lowest column
+            action = max(candidates, key=values.__getitem__) if values else candidates[0]
+            state[row] = action
+            bit = 1 << action
+            cols, ld, rd = cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1
+        return state
+
+    def save(self, path):
+        keys = np.fromiter(self.q.keys(), dtype=np.uint64, count=len(self.q))
+        values = np.array(list(self.q.values()), dtype=np.float32).reshape(len(self.q), self.board_size)
+        np.savez(path, board_size=self.board_size, keys=keys, values=values)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with np.load(path) as data:
+            solver = cls(int(data["board_size"]), **kwargs)
+            solver.q = dict(zip(data["keys"].tolist(), data["values"].tolist()))
+        return solver
+
+
+def load_q_solver(board_size):
+    path = qtable_path(board_size)
+    if not os.path.exists(path):
+        return None
+    return QLearningSolver.load(path)
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import sys
+from datetime import datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import DATA_DIR
+
+DB_PATH = os.path.join(DATA_DIR, "scores.db")
+LEGACY_SCOREBOARD = os.path.join(DATA_DIR, "scoreboard.txt")
+SCHEMA_VERSION = 1
+
+
+def today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def parse_legacy_line(line):
+    # "2025-04-23 - 10x10 - Time: 52s" -> ("2025-04-23", 10, 52)
+    played_on, board_info, time_info = line.strip().split(" - ")
+    return played_on, int(board_info.split("x")[0]), int(time_info.replace("Time: ", "").replace("s", ""))
+
+
+def format_score(played_on, board_size, time_taken):
+    return f"{played_on} - {board_size}x{board_size} - Time: {time_taken}s"
+
+
+class ScoreStore:
+    # Completed games in SQLite. Rows are only ever inserted, and the
+    # indexes let the per-day and per-size questions the UI asks after
+    # every game run without reading the whole history.
+    def __init__(self, path=DB_PATH, legacy_path=LEGACY_SCOREBOARD):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self._migrate(legacy_path)
+
+    def _migrate(self, legacy_path):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    id INTEGER PRIMARY KEY,
+                    played_on TEXT NOT NULL,
+                    board_size INTEGER NOT NULL,
+                    time_taken INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS scores_by_day ON scores (played_on, board_size);
+                CREATE INDEX IF NOT EXISTS scores_by_size ON scores (board_size, time_taken);
+            """)
+            # The old text scoreboard is imported once, when the database is new
+            if legacy_path and os.path.exists(legacy_path):
+                rows = []
+                with open(legacy_path, "r") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            rows.append(parse_legacy_line(line))
+                        except Exception as e:
+                            print(f"Skipping line: {line.strip()} - Error: {e}")
+                self.conn.executemany(
+                    "INSERT INTO scores (played_on, board_size, time_taken) VALUES (?, ?, ?)", rows
+                )
+                print(f"✅ Imported {len(rows)} scores from {legacy_path}")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def add(self, board_size, time_taken, played_on=None):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO scores (played_on, board_size, time_taken) VALUES (?, ?, ?)",
+                (played_on or today(), board_size, time_taken),
+            )
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def recent(self, limit=20):
+        rows = self.conn.execute(
+            "SELECT played_on, board_size, time_taken FROM scores ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return rows[::-1]
+
+    def iter_scores(self, batch_size=10000):
+        # (played_on, board_size, time_taken) in insertion order, fetched in batches
+        for _, *score in self.iter_since(0, batch_size):
+            yield tuple(score)
+
+    def iter_since(self, last_id, batch_size=10000):
+        # (id, played_on, board_size, time_taken) for rows added after `last_id`;
+        # ids only grow, so a caller can resume from the last one it saw
+        cursor = self.conn.execute(
+            "SELECT id, played_on, board_size, time_taken FROM scores WHERE id > ? ORDER BY id", (last_id,)
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def daily_stats(self, played_on=None):
+        # {board_size: (games, average time, best time)} for one day
+        rows = self.conn.execute(
+            "SELECT board_size, COUNT(*), AVG(time_taken), MIN(time_taken) FROM scores "
+            "WHERE played_on = ? GROUP BY board_size",
+            (played_on or today(),),
+        )
+        return {size: (games, avg, best) for size, games, avg, best in rows}
+
+    def average_time(self, played_on=None, board_size=None):
+        # Average over one day, across every size unless one is given; None with no games
+        query = "SELECT AVG(time_taken) FROM scores WHERE played_on = ?"
+        params = [played_on or today()]
+        if board_size is not None:
+            query += " AND board_size = ?"
+            params.append(board_size)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def best_time(self, board_size, played_on=None):
+        # Best time for a size, all-time unless a day is given
+        query = "SELECT MIN(time_taken) FROM scores WHERE board_size = ?"
+        params = [board_size]
+        if played_on is not None:
+            query += " AND played_on = ?"
+            params.append(played_on)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def best_times(self):
+        return dict(self.conn.execute("SELECT board_size, MIN(time_taken) FROM scores GROUP BY board_size"))
+
+
+if __name__ == "__main__":
+    store = ScoreStore()
+    print(f"{len(store)} scores in {store.path}")
+    for size, (games, avg, best) in sorted(store.daily_stats().items()):
+        print(f"{size}x{size}: {games} today, avg {avg:.0f}s, best {best}s")
@@ -1,22 +1,38 @@
+import argparse
+import math
 import random
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from collections import defaultdict
-import pickle
-import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from config import MODEL_DIR
-
-def generate_nqueens_solution(board_size, use_ml=True, use_rl=False, seed=None):
-    if seed is not None:
-        random.seed(seed)
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from solution_index import enumerate_solutions, sample_solution
+from model_registry import get_model
+from solver_table import lookup as lookup_ml_solution
+from rl_engine import MAX_SAVED_BOARD_SIZE, RL_EPISODES, QLearningSolver, load_q_solver, qtable_path
+
+# Solution counts overflow int64 past 21x21
+MAX_COUNT_BOARD_SIZE = 21
+
+def generate_nqueens_solution(board_size, use_ml=True, use_rl=False, seed=None, use_index=True,
+                              use_min_conflicts=False, rng=None):
+    # Every random choice goes through rng, so a seed reproduces the answer
+    # without touching the global random module
+    if rng is None:
+        rng = random.Random(seed) if seed is not None else random
+    # An explicit solver choice wins over the index sample
+    if use_min_conflicts:
+        solution = min_conflicts_solver(board_size, rng=rng)
+        if solution:
+            return solution
+    if use_index:
+        solution = sample_solution(board_size, rng)
+        if solution:
+            return solution
     if use_rl:
-        solution = rl_nqueens_solver(board_size)
+        solution = rl_nqueens_solver(board_size, rng=rng)
         if solution and is_valid_solution(solution):
             return solution
     if use_ml:
-        solution = ml_nqueens_solver(board_size)
+        solution, _ = ml_nqueens_solver(board_size)
         if solution and is_valid_solution(solution):
             return solution
     return backtracking_solver(board_size)
@@ -30,103 +46,315 @@ def is_valid_solution(queens):
                 return False
     return True
 
-def recommend_move(partial_board, board_size):
-    model_path = os.path.join("..", "models", f"move_recommender_{board_size}.pkl")
-    try:
-        with open(model_path, "rb") as f:
-            model = pickle.load(f)
-    except FileNotFoundError:
-        return None
-
+def recommendation_features(partial_board, board_size):
     row = sum([1 for x in partial_board if x != -1])
     features = partial_board[:row] + [-1] * (board_size - row)
     features.append(row)
-    pred = model.predict([features])
+    return features
+
+def recommend_move(partial_board, board_size):
+    model = get_model("recommender", board_size)
+    if model is None:
+        return None
+
+    pred = model.predict([recommendation_features(partial_board, board_size)])
     return pred[0]
 
+def recommend_moves(partial_boards, board_size):
+    # Batched recommend_move: one predict_proba call for every board. Each
+    # board gets (best column, legal columns ranked by probability), where
+    # best is exactly what recommend_move returns and legal means not in a
+    # placed column or touching the last placed queen diagonally.
+    model = get_model("recommender", board_size)
+    if model is None or not len(partial_boards):
+        return [(None, []) for _ in partial_boards]
+
+    X = np.array([recommendation_features(list(b), board_size) for b in partial_boards])
+    order = np.argsort(-model.predict_proba(X), axis=1, kind="stable")
+    ranked_classes = model.classes_[order].tolist()
+    results = []
+    for features, ranked in zip(X.tolist(), ranked_classes):
+        row = features[-1]
+        placed = features[:row]
+        blocked = set(placed)
+        if placed and placed[-1] != -1:
+            blocked.update((placed[-1] - 1, placed[-1] + 1))
+        results.append((ranked[0], [c for c in ranked if c not in blocked]))
+    return results
+
 def backtracking_solver(board_size):
-    def is_safe(queens, row, col):
-        for r in range(row):
-            c = queens[r]
-            if c == col or abs(row - r) == 1 and abs(col - c) == 1:
-                return False
-        return True
+    # Iterative bitboard search: `used[row]` holds the columns taken by the rows
+    # above, `avail[row]` the columns still to try in this row. Candidates are
+    # taken lowest bit first, so the first solution matches a left-to-right scan.
+    if board_size == 0:
+        return []
+    full = (1 << board_size) - 1
+    queens = [0] * board_size
+    used = [0] * board_size
+    avail = [0] * board_size
+    avail[0] = full
+    row = 0
+    while row >= 0:
+        bits = avail[row]
+        if not bits:
+            row -= 1
+            continue
+        bit = bits & -bits
+        avail[row] = bits ^ bit
+        queens[row] = bit.bit_length() - 1
+        if row + 1 == board_size:
+            return queens
+        taken = used[row] | bit
+        used[row + 1] = taken
+        # A queen also attacks the two diagonally adjacent cells of the next row
+        avail[row + 1] = full & ~(taken | (bit << 1) | (bit >> 1))
+        row += 1
+    raise Exception("No valid solution found")
 
-    def solve(row=0, queens=[]):
-        if row == board_size:
-            return queens[:]
-        for col in range(board_size):
-            if col not in queens and is_safe(queens, row, col):
-                queens.append(col)
-                result = solve(row + 1, queens)
-                if result:
-                    return result
-                queens.pop()
+def min_conflicts_solver(board_size, seed=None, max_steps=None, rng=None):
+    # Local search under the classic rule (no shared column or diagonal),
+    # which also satisfies the game's adjacency rule. Per-column and
+    # per-diagonal queen counts are updated in place on every move.
+    if board_size in (2, 3):
         return None
+    rng = rng if rng is not None else random.Random(seed)
+    n = board_size
+    offset = n - 1
+    cols = [0] * n
+    diag = [0] * (2 * n - 1)
+    anti = [0] * (2 * n - 1)
+    queens = [0] * n
 
-    solution = solve()
-    if solution is None:
-        raise Exception("No valid solution found")
-    return solution
+    # Greedy start: each row takes a random unused column, preferring one
+    # whose diagonals are free, so only a handful of conflicts remain
+    free = list(range(n))
+    for row in range(n):
+        for _ in range(min(len(free), 32)):
+            i = rng.randrange(len(free))
+            col = free[i]
+            if not diag[row + col] and not anti[row - col + offset]:
+                break
+        free[i] = free[-1]
+        free.pop()
+        queens[row] = col
+        cols[col] += 1
+        diag[row + col] += 1
+        anti[row - col + offset] += 1
+
+    if max_steps is None:
+        max_steps = 100 * n
+    for step in range(max_steps + 1):
+        conflicted = [r for r in range(n) if cols[queens[r]] > 1 or diag[r + queens[r]] > 1
+                      or anti[r - queens[r] + offset] > 1]
+        if not conflicted:
+            return queens
+        if step == max_steps:
+            break
+        row = rng.choice(conflicted)
+        col = queens[row]
+        cols[col] -= 1
+        diag[row + col] -= 1
+        anti[row - col + offset] -= 1
+
+        costs = [cols[c] + diag[row + c] + anti[row - c + offset] for c in range(n)]
+        best = min(costs)
+        col = rng.choice([c for c in range(n) if costs[c] == best])
+        queens[row] = col
+        cols[col] += 1
+        diag[row + col] += 1
+        anti[row - col + offset] += 1
+    return None
 
 def ml_nqueens_solver(board_size):
-    model_path = os.path.join("..", "models", f"model_{board_size}x{board_size}.pkl")
-    try:
-        with open(model_path, "rb") as f:
-            model = pickle.load(f)
-    except FileNotFoundError:
-        return None, []
-
-    X_test = [[i, board_size, i % 2, i // 2] for i in range(board_size)]
-    prediction = model.predict(X_test)
-
-    if hasattr(model, "predict_proba"):
-        probs = model.predict_proba(X_test)
-        confidences = [max(row) for row in probs]
+    # Answers come from the precompiled table in solver_table, which is
+    # recompiled from the model whenever the model file changes
+    return lookup_ml_solution(board_size)
+
+def rl_nqueens_solver(board_size, episodes=RL_EPISODES, warm_start=True, persist=True, rng=random):
+    # A saved Q-table that already leads to a full placement is used as is;
+    # otherwise train (on top of it, if there is one) and save the result
+    solver = load_q_solver(board_size) if warm_start else None
+    if solver is not None:
+        solution = solver.solve()
+        if solution:
+            return solution
     else:
-        confidences = [1.0] * board_size
+        solver = QLearningSolver(board_size)
 
-    if len(set(prediction)) < board_size:
-        return None, []
+    solver.train(episodes, rng)
+    if persist and board_size <= MAX_SAVED_BOARD_SIZE:
+        solver.save(qtable_path(board_size))
+    return solver.solve()
 
-    return prediction.tolist(), confidences
+def symmetries(queens):
+    # The eight rotations and mirrors of a placement; each is again a valid one,
+    # since touching diagonally is unchanged by them
+    n = len(queens)
+    transposed = [0] * n
+    for row, col in enumerate(queens):
+        transposed[col] = row
+    result = []
+    for q in (list(queens), transposed):
+        mirrored = [n - 1 - c for c in q]
+        result.extend([q, mirrored, q[::-1], mirrored[::-1]])
+    return result
 
-def rl_nqueens_solver(board_size):
-    Q = defaultdict(float)
-    alpha = 0.1
-    gamma = 0.9
-    episodes = 5000
+def is_canonical(queens):
+    # True for the lexicographically smallest member of its symmetry class.
+    # A symmetry's first element is where the queen sits on one board edge,
+    # read in O(1); only the symmetries that tie with queens[0] are built
+    # and compared in full.
+    q = list(queens)
+    n = len(q)
+    if n < 2:
+        return True
+    c, last = q[0], q[-1]
+    left, right = q.index(0), q.index(n - 1)
+    if min(n - 1 - c, last, n - 1 - last, left, n - 1 - left, right, n - 1 - right) < c:
+        return False
+    ties = []
+    if n - 1 - c == c:
+        ties.append([n - 1 - v for v in q])
+    if c in (last, n - 1 - last):
+        reversed_q = q[::-1]
+        ties.extend([reversed_q, [n - 1 - v for v in reversed_q]])
+    if c in (left, n - 1 - left, right, n - 1 - right):
+        transposed = [0] * n
+        for row, col in enumerate(q):
+            transposed[col] = row
+        mirrored = [n - 1 - v for v in transposed]
+        ties.extend([transposed, mirrored, transposed[::-1], mirrored[::-1]])
+    return all(q <= other for other in ties)
 
-    def get_state_key(state):
-        return tuple(state)
+def canonical_row_masks(board_size, first_column):
+    # The first element of each of the eight symmetries is where the queen
+    # sits along one board edge: top or bottom row, left or right column,
+    # read from either end. The canonical member starts with the smallest of
+    # them, so with the top queen at column c every other edge queen is at
+    # least c from the corners: rows above c or below n-1-c cannot use the
+    # edge columns, and the bottom row stays within [c, n-1-c].
+    n, c = board_size, first_column
+    full = (1 << n) - 1
+    edges = 1 | 1 << (n - 1)
+    masks = [full & ~edges if row < c or row > n - 1 - c else full for row in range(n)]
+    masks[0] = full
+    masks[n - 1] &= ((1 << (n - c)) - 1) & ~((1 << c) - 1)
+    return masks
 
-    def is_valid(state, row, col):
-        for r in range(row):
-            if state[r] == col or abs(r - row) == abs(state[r] - col):
-                return False
-        return True
+def canonical_mask(solutions):
+    # is_canonical for a (count, n) array of placements at once: each of the
+    # seven other symmetries is compared at its first differing row
+    q = np.asarray(solutions)
+    if q.shape[1] < 2:
+        return np.ones(len(q), dtype=bool)
+    n = q.shape[1]
+    rows = np.arange(len(q))
+    keep = np.ones(len(q), dtype=bool)
+    transposed = np.argsort(q, axis=1)
+    for base in (q, transposed):
+        for other in (base, n - 1 - base, base[:, ::-1], n - 1 - base[:, ::-1]):
+            if other is q:
+                continue
+            differs = other != q
+            first = differs.argmax(axis=1)
+            keep &= ~(differs[rows, first] & (other[rows, first] < q[rows, first]))
+    return keep
 
-    for _ in range(episodes):
-        state = [-1] * board_size
-        for row in range(board_size):
-            actions = [c for c in range(board_size) if is_valid(state, row, c)]
-            if not actions:
-                break
-            action = random.choice(actions)
-            next_state = state[:]
-            next_state[row] = action
-            reward = 1 if is_valid(next_state, row, action) else -10
-            Q[(get_state_key(state), action)] += alpha * (reward + gamma * max(
-                Q.get((get_state_key(next_state), a), 0) for a in range(board_size)) - Q[(get_state_key(state), action)])
-            state = next_state
-
-    state = [-1] * board_size
-    for row in range(board_size):
-        valid_actions = [(action, Q[(get_state_key(state), action)])
-                         for action in range(board_size) if is_valid(state, row, action)]
-        if not valid_actions:
-            return None
-        best_action = max(valid_actions, key=lambda x: x[1])[0]
-        state[row] = best_action
-
-    return state
+def _solutions_from(board_size, first_column, unique, batch_size=65536):
+    if not unique:
+        yield from enumerate_solutions(board_size, first_column)
+        return
+    # The pruned search only leaves placements whose symmetries tie on the
+    # first element; the canonical test settles those a batch at a time
+    batch = []
+    for queens in enumerate_solutions(board_size, first_column, canonical_row_masks(board_size, first_column)):
+        batch.append(bytes(queens))
+        if len(batch) == batch_size:
+            yield from _canonical_rows(batch, board_size)
+            batch = []
+    if batch:
+        yield from _canonical_rows(batch, board_size)
+
+def _canonical_rows(batch, board_size):
+    solutions = np.frombuffer(b"".join(batch), dtype=np.uint8).reshape(-1, board_size).astype(np.int64)
+    return solutions[canonical_mask(solutions)].tolist()
+
+def _solutions_blob(board_size, first_column, unique):
+    return b"".join(bytes(q) for q in _solutions_from(board_size, first_column, unique))
+
+def iter_solutions(board_size, unique=False, workers=1):
+    # Every placement valid under the game's rule, in lexicographic order,
+    # from a bitmask search split by first-row column. unique=True yields one
+    # placement per rotation/mirror class, about 1/8 of them: only left-half
+    # first-row columns are searched, and canonical_row_masks prunes the
+    # branches whose symmetries would start with a smaller column. With
+    # workers > 1 each first-row column is searched in its own process.
+    if board_size == 0:
+        yield []
+        return
+    columns = range((board_size + 1) // 2) if unique else range(board_size)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for blob in pool.map(_solutions_blob, repeat(board_size), columns, repeat(unique)):
+                for start in range(0, len(blob), board_size):
+                    yield list(blob[start:start + board_size])
+    else:
+        for col in columns:
+            yield from _solutions_from(board_size, col, unique)
+
+def _count_paths(board_size, seeds):
+    # Counts placements as paths through the (used columns, last column) DAG
+    # that hint_engine tabulates, one row at a time. seeds maps a first-row
+    # column to the weight its paths count with. Only the current row's
+    # reachable masks are kept.
+    n = board_size
+    masks = np.array([1 << c for c in seeds], dtype=np.int64)
+    counts = np.zeros((len(masks), n), dtype=np.int64)
+    for i, (col, weight) in enumerate(seeds.items()):
+        counts[i, col] = weight
+    position = np.zeros(1 << n, dtype=np.int32)
+    for _ in range(1, n):
+        totals = counts.sum(axis=1)
+        moves = []
+        for col in range(n):
+            free = (masks >> col) & 1 == 0
+            paths = totals[free]
+            # Every path except those whose last queen touches this column
+            if col > 0:
+                paths = paths - counts[free, col - 1]
+            if col < n - 1:
+                paths = paths - counts[free, col + 1]
+            keep = paths != 0
+            moves.append((col, masks[free][keep] | (1 << col), paths[keep]))
+        masks = np.unique(np.concatenate([m for _, m, _ in moves]))
+        position[masks] = np.arange(len(masks))
+        counts = np.zeros((len(masks), n), dtype=np.int64)
+        for col, next_masks, paths in moves:
+            counts[position[next_masks], col] = paths
+    return int(counts.sum())
+
+def count_solutions(board_size, unique=False, workers=1):
+    # Number of valid placements. Only the mirror symmetry is used, which
+    # halves the seeds: first-row columns in the left half are followed and
+    # counted twice (the middle column of an odd board once). Rotations do
+    # not map first-row columns onto each other, so the row-by-row count
+    # cannot use them. unique=True counts rotation/mirror classes by
+    # enumerating them instead, so it is only practical to about 12x12.
+    if unique:
+        return sum(1 for _ in iter_solutions(board_size, unique=True, workers=workers))
+    if board_size > MAX_COUNT_BOARD_SIZE:
+        raise ValueError(f"Counts past {MAX_COUNT_BOARD_SIZE}x{MAX_COUNT_BOARD_SIZE} do not fit in 64 bits")
+    if board_size == 0:
+        return 1
+    seeds = {col: 2 for col in range(board_size // 2)}
+    if board_size % 2:
+        seeds[board_size // 2] = 1
+    return _count_paths(board_size, seeds)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count valid placements per board size")
+    parser.add_argument("sizes", nargs="*", type=int, default=list(range(4, MAX_COUNT_BOARD_SIZE + 1)))
+    args = parser.parse_args()
+    for size in args.sizes:
+        count = count_solutions(size)
+        print(f"{size}x{size}: {count} solutions, density {count / math.factorial(size):.3e} of all permutations")
@@ -0,0 +1,172 @@
+import argparse
+import mmap
+import os
+import random
+import sys
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import MODEL_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
+
+# Sizes from 10x10 up have hundreds of thousands to billions of placements, so
+# only this many are kept per size (the first one is always the lexicographic one)
+MAX_INDEXED_SOLUTIONS = 50000
+
+
+def index_path(board_size):
+    return os.path.join(MODEL_DIR, f"solutions_{board_size}x{board_size}.bin")
+
+
+def enumerate_solutions(board_size, first_column=None, row_masks=None):
+    # Same bitboard search as backtracking_solver, but keeps going after each
+    # hit, yielding every placement in lexicographic order. row_masks, if
+    # given, limits the columns each row may use.
+    if board_size == 0:
+        yield []
+        return
+    full = (1 << board_size) - 1
+    queens = [0] * board_size
+    used = [0] * board_size
+    avail = [0] * board_size
+    avail[0] = full if first_column is None else 1 << first_column
+    if row_masks is not None:
+        avail[0] &= row_masks[0]
+    row = 0
+    while row >= 0:
+        bits = avail[row]
+        if not bits:
+            row -= 1
+            continue
+        bit = bits & -bits
+        avail[row] = bits ^ bit
+        queens[row] = bit.bit_length() - 1
+        if row + 1 == board_size:
+            yield queens[:]
+            continue
+        taken = used[row] | bit
+        used[row + 1] = taken
+        avail[row + 1] = full & ~(taken | (bit << 1) | (bit >> 1))
+        if row_masks is not None:
+            avail[row + 1] &= row_masks[row + 1]
+        row += 1
+
+
+def random_solution(board_size, rng=random):
+    full = (1 << board_size) - 1
+    queens = [0] * board_size
+    used = [0] * board_size
+    avail = [0] * board_size
+    avail[0] = full
+    row = 0
+    while row >= 0:
+        bits = avail[row]
+        if not bits:
+            row -= 1
+            continue
+        col = rng.choice([c for c in range(board_size) if bits >> c & 1])
+        bit = 1 << col
+        avail[row] = bits ^ bit
+        queens[row] = col
+        if row + 1 == board_size:
+            return queens
+        taken = used[row] | bit
+        used[row + 1] = taken
+        avail[row + 1] = full & ~(taken | (bit << 1) | (bit >> 1))
+        row += 1
+    return None
+
+
+def build_solution_index(board_size, max_solutions=MAX_INDEXED_SOLUTIONS, seed=0):
+    solutions = []
+    for queens in enumerate_solutions(board_size):
+        solutions.append(bytes(queens))
+        if len(solutions) > max_solutions:
+            break
+
+    if len(solutions) > max_solutions:
+        # Too many to store them all: keep the first one and fill the rest
+        # with distinct random placements
+        rng = random.Random(seed)
+        picked = {solutions[0]}
+        solutions = [solutions[0]]
+        while len(solutions) < max_solutions:
+            row = bytes(random_solution(board_size, rng))
+            if row not in picked:
+                picked.add(row)
+                solutions.append(row)
+
+    path = index_path(board_size)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for row in solutions:
+            f.write(row)
+    os.replace(tmp_path, path)
+    _indexes.pop(board_size, None)
+    return len(solutions)
+
+
+class SolutionIndex:
+    def __init__(self, board_size, path):
+        self.board_size = board_size
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = len(self._map) // board_size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = i * self.board_size
+        return list(self._map[start:start + self.board_size])
+
+    def sample(self, rng=random):
+        return self[rng.randrange(self.count)]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+_indexes = {}
+
+
+def load_solution_index(board_size):
+    if board_size in _indexes:
+        return _indexes[board_size]
+    path = index_path(board_size)
+    if board_size <= 0 or not os.path.exists(path) or os.path.getsize(path) < board_size:
+        return None
+    index = SolutionIndex(board_size, path)
+    _indexes[board_size] = index
+    return index
+
+
+def sample_solution(board_size, rng=random):
+    index = load_solution_index(board_size)
+    if index is None:
+        return None
+    return index.sample(rng)
+
+
+def solution_array(board_size):
+    # Whole index as a read-only (count, board_size) uint8 array
+    index = load_solution_index(board_size)
+    if index is None:
+        return None
+    return np.memmap(index_path(board_size), dtype=np.uint8, mode="r").reshape(-1, board_size)
+
+
+def first_solution(board_size):
+    index = load_solution_index(board_size)
+    if index is not None:
+        return index[0]
+    return next(enumerate_solutions(board_size), None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the per-size solution index")
+    parser.add_argument("sizes", nargs="*", type=int, default=list(range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1)))
+    parser.add_argument("--max-solutions", type=int, default=MAX_INDEXED_SOLUTIONS)
+    args = parser.parse_args()
+    for size in args.sizes:
+        count = build_solution_index(size, args.max_solutions)
+        print(f"✅ Indexed {count} solutions for {size}x{size} in {os.path.basename(index_path(size))}")
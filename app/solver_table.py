@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config import MODEL_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
+from forest_export import compact_path
+from model_registry import registry
+
+# The solver features [i, n, i % 2, i // 2] only depend on the row and the
+# size, so each model's answer is fixed and can be computed ahead of time
+TABLE_PATH = os.path.join(MODEL_DIR, "ml_solver_table.json")
+
+_table = None
+_lock = threading.Lock()
+
+
+def model_stamp(board_size):
+    # (mtime, size) of every model file for this size; a change means the
+    # table entry was compiled from a different model
+    path = registry.model_path("solver", board_size)
+    stamp = []
+    for p in (path, compact_path(path)):
+        try:
+            st = os.stat(p)
+            stamp.append([os.path.basename(p), st.st_mtime_ns, st.st_size])
+        except FileNotFoundError:
+            pass
+    return stamp
+
+
+def compile_entry(board_size):
+    registry.invalidate("solver", board_size)
+    model = registry.get("solver", board_size)
+    entry = {"stamp": model_stamp(board_size), "solution": None, "confidences": []}
+    if model is None:
+        return entry
+
+    X_test = [[i, board_size, i % 2, i // 2] for i in range(board_size)]
+    prediction = model.predict(X_test)
+
+    if hasattr(model, "predict_proba"):
+        probs = model.predict_proba(X_test)
+        confidences = [float(max(row)) for row in probs]
+    else:
+        confidences = [1.0] * board_size
+
+    if len(set(prediction)) == board_size:
+        entry["solution"] = [int(col) for col in prediction]
+        entry["confidences"] = confidences
+    return entry
+
+
+def load_table(path=None):
+    try:
+        with open(path or TABLE_PATH, "r") as f:
+            return {int(size): entry for size, entry in json.load(f).items()}
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_table(table, path=None):
+    path = path or TABLE_PATH
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({str(size): entry for size, entry in sorted(table.items())}, f)
+    os.replace(tmp_path, path)
+
+
+def lookup(board_size):
+    global _table
+    with _lock:
+        if _table is None:
+            _table = load_table()
+        entry = _table.get(board_size)
+        if entry is None or entry["stamp"] != model_stamp(board_size):
+            entry = compile_entry(board_size)
+            _table[board_size] = entry
+            # The entry stays in memory, so a read-only MODEL_DIR only means
+            # recompiling on the next start
+            try:
+                save_table(_table)
+            except OSError as e:
+                print(f"Could not save {TABLE_PATH}: {e}")
+    if entry["solution"] is None:
+        return None, []
+    return list(entry["solution"]), list(entry["confidences"])
+
+
+def compile_table(sizes):
+    global _table
+    with _lock:
+        _table = load_table()
+        for size in sizes:
+            _table[size] = compile_entry(size)
+        save_table(_table)
+    return _table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute ml_nqueens_solver answers for every board size")
+    parser.add_argument("sizes", nargs="*", type=int, default=list(range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1)))
+    args = parser.parse_args()
+    table = compile_table(args.sizes)
+    for size in args.sizes:
+        state = "solved" if table[size]["solution"] else "no valid prediction"
+        print(f"✅ {size}x{size}: {state}")
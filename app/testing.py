@@ -1,10 +1,10 @@
 from sklearn.metrics import f1_score, accuracy_score
-from solution import backtracking_solver
+from solution_index import first_solution
 import os
 import pickle
 
 def generate_true_labels(board_size):
-    solution = backtracking_solver(board_size)
+    solution = first_solution(board_size)
     return solution  # Each index is row, each value is correct column
 
 
@@ -1,4 +1,4 @@
-import pandas as pd
+import numpy as np
 import os
 import pickle
 import sys
@@ -7,11 +7,17 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 from config import DATA_DIR
+from difficulty_label_generator import read_difficulty_chunks
 
-df = pd.read_csv(os.path.join(DATA_DIR, "difficulty_data.csv"))
+# Chunks are reduced to compact arrays as they arrive; only the final
+# feature matrix and labels are held at once
+features, labels = [], []
+for chunk in read_difficulty_chunks():
+    features.append(chunk[["board_size", "time_taken"]].to_numpy(dtype=np.int32))
+    labels.append(chunk["difficulty"].astype(str).to_numpy())
 
-X = df[["board_size", "time_taken"]]
-y = df["difficulty"]
+X = np.concatenate(features)
+y = np.concatenate(labels)
 
 label_encoder = LabelEncoder()
 y_encoded = label_encoder.fit_transform(y)
@@ -3,8 +3,11 @@ from tkinter import ttk
 import time
 import sys
 import pygame
-from grid import GridGenerator
-from solution import generate_nqueens_solution
+from puzzle_service import PuzzleService
+from puzzle_cache import PuzzleCache, daily_puzzle
+from board_state import BoardState
+from board_renderer import BoardRenderer
+from score_store import ScoreStore, format_score
 import random
 from datetime import datetime, timedelta
 import requests
@@ -12,12 +15,15 @@ from PIL import Image, ImageTk
 from io import BytesIO
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from config import DATA_DIR
-from solution import ml_nqueens_solver
+from config import DATA_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE, MAX_BOARD_SIZE
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from solution import recommend_move
 from utils_difficulty import predict_difficulty
+from model_registry import preload_models
+
+BOARD_PIXELS = 400
+MIN_CELL_PIXELS = 12
+
 class NQueensGame:
     def __init__(self, root):
         self.root = root
@@ -25,8 +31,7 @@ class NQueensGame:
         self.start_time = None
         self.timer_label = None
         self.canvas = None
-        self.previous_scores = []
-        self.queen_positions = {}
+        self.board = None
         self.error_label = None
         self.game_active = True
         self.original_colors = {}
@@ -38,13 +43,16 @@ class NQueensGame:
         self.mistake_rows = set()
         self.user_moves = []
 
-        self.crown_image = ImageTk.PhotoImage(Image.open("../assets/crown.png").resize((32, 32)))
-        self.crownconflict_image = ImageTk.PhotoImage(Image.open("../assets/swords.png").resize((32, 32)))
+        self.crown_source = Image.open("../assets/crown.png")
+        self.crownconflict_source = Image.open("../assets/swords.png")
+        self.piece_images = {}
+        self.crown_image, self.crownconflict_image = self.load_piece_images(400 // MIN_BOARD_SIZE)
         pygame.mixer.init()
         if self.play_music:
             pygame.mixer.music.load("../music/Just Getting Started.mp3")
             pygame.mixer.music.play(-1)
-        self.load_scores()
+        self.puzzle_service = PuzzleService(self.root, cache=PuzzleCache())
+        self.scores = ScoreStore()
         self.show_loading_screen()
         self.root.after(2000, self.show_welcome_screen)
 
@@ -57,6 +65,8 @@ class NQueensGame:
         progress = ttk.Progressbar(frame, mode='indeterminate')
         progress.pack(pady=20)
         progress.start(10)
+        preload_models()
+        self.puzzle_service.fill(range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1))
     
     def show_analysis_graph(self):
         if not hasattr(self, "recommendations") or not self.recommendations:
@@ -106,21 +116,6 @@ class NQueensGame:
         canvas2.draw()
         canvas2.get_tk_widget().pack(pady=10)
 
-    def load_scores(self):
-        path = os.path.join(DATA_DIR, "scoreboard.txt")
-        try:
-            with open(path, "r") as f:
-                self.previous_scores = [line.strip() for line in f.readlines()]
-        except FileNotFoundError:
-            self.previous_scores = []
-
-
-    def save_scores(self):
-        path = os.path.join(DATA_DIR, "scoreboard.txt")
-        with open(path, "w") as f:
-            for score in self.previous_scores:
-                f.write(score + "\n")
-
     def load_high_scores(self):
         path = os.path.join(DATA_DIR, "highscores.txt")
         try:
@@ -138,6 +133,7 @@ class NQueensGame:
                 f.write(f"{level}: {time_}s\n")
 
     def show_welcome_screen(self):
+        self.puzzle_service.cancel()
         if self.play_music:
             pygame.mixer.music.stop()
             pygame.mixer.music.load("../music/Just Getting Started.mp3")
@@ -148,6 +144,7 @@ class NQueensGame:
         frame.pack(expand=True)
         ttk.Label(frame, text="♛ N-Queens ML Challenge", font=("Arial", 22, "bold")).pack(pady=20)
         ttk.Button(frame, text="▶ Start Game", command=self.start_game).pack(pady=10)
+        ttk.Button(frame, text="📅 Daily Puzzle", command=self.start_daily_game).pack(pady=10)
         ttk.Button(frame, text="📊 View Scoreboard", command=self.show_scoreboard).pack(pady=10)
         ttk.Button(frame, text="⚙ Settings", command=self.show_settings_screen).pack(pady=10)
 
@@ -177,46 +174,84 @@ class NQueensGame:
         frame = ttk.Frame(self.root, padding="30")
         frame.pack(expand=True)
         ttk.Label(frame, text="📋 Scoreboard", font=("Arial", 18)).pack(pady=10)
-        for score in self.previous_scores:
-            ttk.Label(frame, text=score, font=("Arial", 12)).pack()
+        for score in self.scores.recent():
+            ttk.Label(frame, text=format_score(*score), font=("Arial", 12)).pack()
         ttk.Button(frame, text="🔙 Back", command=self.show_welcome_screen).pack(pady=20)
 
     def start_game(self):
+        self.start_specific_game(random.randint(MIN_BOARD_SIZE, self.max_board_size()))
+
+    def start_daily_game(self):
+        # Same size and seed on every install for a given date
+        self.start_specific_game(*daily_puzzle())
+
+    def max_board_size(self):
+        # Every streak day past the first unlocks one size beyond the ML range
+        _, streak = self.load_streak_data()
+        return min(MAX_BOARD_SIZE, MAX_ML_BOARD_SIZE + max(streak - 1, 0))
+
+    def load_piece_images(self, cell_size):
+        # Crowns are 32px, shrunk to fit the cells of large boards
+        size = min(32, max(cell_size - 4, 6))
+        if size not in self.piece_images:
+            self.piece_images[size] = (
+                ImageTk.PhotoImage(self.crown_source.resize((size, size))),
+                ImageTk.PhotoImage(self.crownconflict_source.resize((size, size))),
+            )
+        return self.piece_images[size]
+
+    def start_specific_game(self, board_size, seed=None):
         if self.play_music:
             pygame.mixer.music.stop()
             pygame.mixer.music.load("../music/gamesound.mp3")
             pygame.mixer.music.play(-1)
         for widget in self.root.winfo_children():
             widget.destroy()
+        self.game_active = False
+
+        # Prefetched or cached boards start at once; otherwise wait for the worker
+        if not self.puzzle_service.request(board_size, self.begin_game, seed, self.puzzle_failed):
+            frame = ttk.Frame(self.root, padding="30")
+            frame.pack(expand=True)
+            ttk.Label(frame, text=f"🧩 Preparing {board_size}x{board_size} board...", font=("Arial", 14)).pack(pady=20)
+            progress = ttk.Progressbar(frame, mode='indeterminate')
+            progress.pack(pady=10)
+            progress.start(10)
+            ttk.Button(frame, text="🔙 Back", command=self.show_welcome_screen).pack(pady=10)
+
+    def puzzle_failed(self, board_size, seed, error):
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        frame = ttk.Frame(self.root, padding="30")
+        frame.pack(expand=True)
+        ttk.Label(frame, text=f"❌ Could not prepare a {board_size}x{board_size} board", font=("Arial", 14)).pack(pady=10)
+        ttk.Label(frame, text=str(error), font=("Arial", 10)).pack(pady=5)
+        ttk.Button(frame, text="🔁 Try Again", command=lambda: self.start_specific_game(board_size, seed)).pack(pady=5)
+        ttk.Button(frame, text="🔙 Back", command=self.show_welcome_screen).pack(pady=5)
 
-        self.board_size = random.randint(4, 14)
+    def begin_game(self, puzzle):
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+        self.board_size = puzzle["board_size"]
+        self.puzzle_seed = puzzle["seed"]
         self.level = self.board_size
-        import colorsys
-
-        def generate_distinct_colors(n):
-            colors = []
-            for i in range(n):
-                hue = i / n
-                r, g, b = colorsys.hsv_to_rgb(hue, 0.7, 0.9)
-                colors.append(f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}')
-            return colors
-
-        self.colors = random.sample(generate_distinct_colors(self.board_size),min(self.board_size, 14))
-        self.solution, self.confidences = ml_nqueens_solver(self.board_size)
-        if self.solution is None:
-            self.solution = generate_nqueens_solution(self.board_size, use_ml=False, use_rl=True)
-            self.confidences = [0.0] * self.board_size
+        self.colors = puzzle["colors"]
+        self.solution = puzzle["solution"]
+        self.confidences = puzzle["confidences"]
         self.mistake_rows = set()
         self.user_moves = []
         self.recommendations = [(i, col) for i, col in enumerate(self.solution)]
         self.mistakes = [False] * self.board_size
+        self.grid = puzzle["grid"]
+        self.hints = puzzle["hints"]
 
-        self.grid_generator = GridGenerator(self.board_size, self.colors, seed=random.randint(0, 100000))
-        self.grid = self.grid_generator.generate_grid(self.solution)
-
-        self.time_limit = max(90 - (self.board_size * 3), 30)
+        # Boards past 20x20 get extra time instead of the 30s floor
+        self.time_limit = max(90 - (self.board_size * 3), 30, (self.board_size - 14) * 6)
+        self.cell_size = max(BOARD_PIXELS // self.board_size, MIN_CELL_PIXELS)
+        self.crown_image, self.crownconflict_image = self.load_piece_images(self.cell_size)
         self.start_time = time.time()
-        self.queen_positions = {}
+        self.board = BoardState(self.grid)
         self.game_active = True
         self.original_colors = {}
 
@@ -229,8 +264,11 @@ class NQueensGame:
         self.error_label = ttk.Label(frame, text="", font=("Arial", 12), foreground="red")
         self.error_label.pack(pady=5)
 
-        self.canvas = tk.Canvas(frame, width=400, height=400)
+        board_pixels = self.cell_size * self.board_size
+        self.canvas = tk.Canvas(frame, width=board_pixels, height=board_pixels)
         self.canvas.pack()
+        self.renderer = BoardRenderer(self.canvas, self.grid, self.cell_size,
+                                      self.crown_image, self.crownconflict_image)
 
         button_frame = ttk.Frame(frame)
         button_frame.pack(pady=10)
@@ -258,47 +296,22 @@ class NQueensGame:
                 self.root.after(1000, self.update_timer)
 
     def display_grid(self):
-        self.canvas.delete("all")
-        cell_size = 400 // self.board_size
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                color = self.grid[i][j]
-                self.canvas.create_rectangle(
-                    j * cell_size, i * cell_size,
-                    (j+1) * cell_size, (i+1) * cell_size,
-                    fill=color, outline="black"
-                )
-                if (i, j) in self.queen_positions:
-                    if self.queen_positions[(i, j)]:
-                        self.canvas.create_image(
-                            j * cell_size + cell_size // 2,
-                            i * cell_size + cell_size // 2,
-                            image=self.crown_image,
-                            anchor="center"
-                        )
-                    else:
-                        self.canvas.create_image(
-                            j * cell_size + cell_size // 2,
-                            i * cell_size + cell_size // 2,
-                            image= self.crownconflict_image, 
-                            anchor='center'
-                        )
-
-        if len(self.queen_positions) == self.board_size and all(self.queen_positions.values()):
+        self.renderer.sync(self.board)
+        if self.board.is_solved():
             self.end_game()
 
     def place_queen(self, event):
         if not self.game_active:
             return
-        cell_size = 400 // self.board_size
+        cell_size = self.cell_size
         row = event.y // cell_size
         col = event.x // cell_size
 
-        if (row, col) in self.queen_positions:
+        if row >= self.board_size or col >= self.board_size or (row, col) in self.board:
             return
 
-        valid = self.is_valid_placement(row, col)
-        self.queen_positions[(row, col)] = valid
+        valid = self.board.is_valid_placement(row, col)
+        self.board.place(row, col)
         self.error_label.config(text="" if valid else "Invalid placement!")
         self.user_moves.append((row, col))  # Record actual move
 
@@ -309,11 +322,8 @@ class NQueensGame:
                 self.mistakes.append((row, col, predicted_col))
                 self.mistake_rows.add(row)
 
-        # 🧠 Optionally compare with dynamic model recommendation
-        partial = [-1] * self.board_size
-        for (r, c), _ in self.queen_positions.items():
-            partial[r] = c
-        dynamic_recommended = recommend_move(partial, self.board_size)
+        # 🧠 Optionally compare with dynamic model recommendation (precomputed hint)
+        dynamic_recommended = self.hints.best(self.board.partial_board())
         self.recommendations.append((row, dynamic_recommended))
 
         self.display_grid()
@@ -321,30 +331,23 @@ class NQueensGame:
     def remove_queen(self, event):
         if not self.game_active:
             return
-        cell_size = 400 // self.board_size
+        cell_size = self.cell_size
         row = event.y // cell_size
         col = event.x // cell_size
 
-        if (row, col) in self.queen_positions:
-            del self.queen_positions[(row, col)]
+        if (row, col) in self.board:
+            self.board.remove(row, col)
             self.error_label.config(text="")
             self.display_grid()
 
     def clear_board(self):
-        self.queen_positions = {}
+        self.board.clear()
         self.error_label.config(text="")
         self.display_grid()
 
-    def is_valid_placement(self, row, col):
-        for (r, c), valid in self.queen_positions.items():
-            if r == row or c == col or (abs(r - row)==1 and abs(c - col)==1):
-                return False
-        return True
-
     def end_game(self, failed=False):
         self.game_active = False
         elapsed_time = int(time.time() - self.start_time)
-        today = self.get_today_date()
         try:
             difficulty = predict_difficulty(self.board_size, elapsed_time)
             print(f"Predicted difficulty: {difficulty}")
@@ -354,9 +357,7 @@ class NQueensGame:
 
         new_record = False
         if not failed:
-            score_entry = f"{today} - {self.board_size}x{self.board_size} - Time: {elapsed_time}s"
-            self.previous_scores.append(score_entry)
-            self.save_scores()
+            self.scores.add(self.board_size, elapsed_time, self.get_today_date())
 
             high_scores = self.load_high_scores()
             prev_best = high_scores.get(self.board_size, None)
@@ -395,71 +396,6 @@ class NQueensGame:
             f.write(f"{today},{streak}")
         return streak
 
-    def get_today_times(self):
-        today = self.get_today_date()
-        return [
-            int(score.split("Time: ")[1].replace("s", ""))
-            for score in self.previous_scores if score.startswith(today)
-        ]
-
-    def start_specific_game(self, board_size):
-        if self.play_music:
-            pygame.mixer.music.stop()
-            pygame.mixer.music.load("../music/gamesound.mp3")
-            pygame.mixer.music.play(-1)
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-        self.board_size = board_size
-        self.level = board_size
-        import colorsys
-
-        def generate_distinct_colors(n):
-            colors = []
-            for i in range(n):
-                hue = i / n
-                r, g, b = colorsys.hsv_to_rgb(hue, 0.7, 0.9)
-                colors.append(f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}')
-            return colors
-
-        self.colors = random.sample(generate_distinct_colors(self.board_size), min(self.board_size, 14))
-        self.solution, self.confidences = ml_nqueens_solver(self.board_size)
-        if self.solution is None:
-            self.solution = generate_nqueens_solution(self.board_size, use_ml=False, use_rl=True)
-            self.confidences = [0.0] * self.board_size
-        self.mistake_rows = set()
-        self.grid_generator = GridGenerator(self.board_size, self.colors, seed=random.randint(0, 100000))
-        self.grid = self.grid_generator.generate_grid(self.solution)
-
-        self.time_limit = max(90 - (self.board_size * 3), 30)
-        self.start_time = time.time()
-        self.queen_positions = {}
-        self.game_active = True
-        self.original_colors = {}
-
-        frame = ttk.Frame(self.root, padding="20")
-        frame.pack()
-
-        ttk.Label(frame, text=f"🎮 Level {self.level} - {self.board_size}x{self.board_size}", font=("Arial", 14)).pack(pady=5)
-        self.timer_label = ttk.Label(frame, text="Time Left: 0s", font=("Arial", 12))
-        self.timer_label.pack(pady=5)
-        self.error_label = ttk.Label(frame, text="", font=("Arial", 12), foreground="red")
-        self.error_label.pack(pady=5)
-
-        self.canvas = tk.Canvas(frame, width=400, height=400)
-        self.canvas.pack()
-
-        button_frame = ttk.Frame(frame)
-        button_frame.pack(pady=10)
-        ttk.Button(button_frame, text="🧹 Clear", command=self.clear_board).pack(side="left", padx=5)
-        ttk.Button(button_frame, text="🔙 Back", command=self.show_welcome_screen).pack(side="left", padx=5)
-
-        self.canvas.bind("<Button-1>", self.place_queen)
-        self.canvas.bind("<Double-Button-1>", self.remove_queen)
-
-        self.display_grid()
-        self.update_timer()
-
     def show_completion_screen(self, time_taken, streak=None, failed=False, new_record=False):
         for widget in self.root.winfo_children():
             widget.destroy()
@@ -474,7 +410,8 @@ class NQueensGame:
             ttk.Label(frame, text="Try Again or Start Fresh!", font=("Arial", 12, "italic")).pack(pady=10)
 
             def retry_same_level():
-                self.start_specific_game(self.board_size)
+                # Same seed, so the same board comes back from the cache
+                self.start_specific_game(self.board_size, self.puzzle_seed)
 
 
             ttk.Button(frame, text="🔁 Try Same Level", command=retry_same_level).pack(pady=5)
@@ -490,8 +427,7 @@ class NQueensGame:
                 best = self.load_high_scores().get(self.board_size)
                 if best:
                     ttk.Label(frame, text=f"🏆 Best Time: {best}s", font=("Arial", 12)).pack(pady=5)
-            today_times = self.get_today_times()
-            avg_time = sum(today_times) // len(today_times) if today_times else 0
+            avg_time = int(self.scores.average_time(self.get_today_date()) or 0)
             ttk.Label(frame, text=f"Today's Avg: {avg_time}s", font=("Arial", 12, "italic")).pack(pady=5)
             ttk.Label(frame, text=f"🔥 Current Streak: {streak} day{'s' if streak > 1 else ''}", font=("Arial", 12)).pack(pady=10)
         ttk.Button(frame, text="🔁 New Game", command=self.start_game).pack(pady=5)
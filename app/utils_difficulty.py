@@ -1,20 +1,75 @@
 import pickle
 import os
 import sys
+import numpy as np
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from config import DATA_DIR
+from config import DATA_DIR, MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE
 
-def predict_difficulty(board_size, time_taken):
-    model_path = os.path.join(DATA_DIR, "difficulty_model.pkl")
-    encoder_path = os.path.join(DATA_DIR, "difficulty_encoder.pkl")
+MODEL_PATH = os.path.join(DATA_DIR, "difficulty_model.pkl")
+ENCODER_PATH = os.path.join(DATA_DIR, "difficulty_encoder.pkl")
+
+# Input domain covered by the lookup table: the board sizes with trained
+# models, whose time limits never pass 90 s. Bigger boards (time limits up to
+# 216 s at 50x50) and longer times fall back to a single predict call
+TABLE_SIZES = range(MIN_BOARD_SIZE, MAX_ML_BOARD_SIZE + 1)
+TABLE_SECONDS = range(0, 91)
+
+
+class DifficultyPredictor:
+    def __init__(self, model_path=MODEL_PATH, encoder_path=ENCODER_PATH):
+        with open(model_path, "rb") as f:
+            self.model = pickle.load(f)
+        with open(encoder_path, "rb") as f:
+            self.encoder = pickle.load(f)
+        self._table = None
+
+    def predict_batch(self, board_sizes, times_taken):
+        X = np.column_stack([np.asarray(board_sizes), np.asarray(times_taken)])
+        if not len(X):
+            return []
+        return self.encoder.inverse_transform(self.model.predict(X)).tolist()
+
+    @property
+    def table(self):
+        # table[size - MIN_BOARD_SIZE][seconds] -> label, built with a single predict call
+        if self._table is None:
+            sizes, seconds = np.meshgrid(TABLE_SIZES, TABLE_SECONDS, indexing="ij")
+            labels = self.predict_batch(sizes.ravel(), seconds.ravel())
+            width = len(TABLE_SECONDS)
+            self._table = [labels[i * width:(i + 1) * width] for i in range(len(TABLE_SIZES))]
+        return self._table
+
+    def predict(self, board_size, time_taken):
+        if board_size in TABLE_SIZES and time_taken in TABLE_SECONDS:
+            return self.table[int(board_size) - TABLE_SIZES.start][int(time_taken) - TABLE_SECONDS.start]
+        return self.predict_batch([board_size], [time_taken])[0]
 
-    if not os.path.exists(model_path) or not os.path.exists(encoder_path):
+
+_predictor = None
+
+
+def get_predictor():
+    global _predictor
+    if _predictor is None:
+        if not os.path.exists(MODEL_PATH) or not os.path.exists(ENCODER_PATH):
+            return None
+        _predictor = DifficultyPredictor()
+    return _predictor
+
+
+def predict_difficulty(board_size, time_taken):
+    predictor = get_predictor()
+    if predictor is None:
         return "Unknown"
+    return predictor.predict(board_size, time_taken)
 
-    with open(model_path, "rb") as f:
-        model = pickle.load(f)
-    with open(encoder_path, "rb") as f:
-        encoder = pickle.load(f)
 
-    pred = model.predict([[board_size, time_taken]])
-    return encoder.inverse_transform(pred)[0]
+def predict_difficulties(pairs):
+    # Bulk variant for (board_size, time_taken) pairs, e.g. a whole scoreboard
+    predictor = get_predictor()
+    if predictor is None:
+        return ["Unknown"] * len(pairs)
+    if not pairs:
+        return []
+    board_sizes, times_taken = zip(*pairs)
+    return predictor.predict_batch(board_sizes, times_taken)
@@ -7,6 +7,12 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_DIR = os.path.join(BASE_DIR, "models")
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
+# Board sizes: models are trained up to MAX_ML_BOARD_SIZE, bigger boards are
+# solved by search only
+MIN_BOARD_SIZE = 4
+MAX_ML_BOARD_SIZE = 14
+MAX_BOARD_SIZE = 50
+
 # Ensure folders exist
 os.makedirs(MODEL_DIR, exist_ok=True)
 os.makedirs(DATA_DIR, exist_ok=True)